@@ -1,50 +1,23 @@
-from ursina import Ursina, Entity, camera, window, color, Vec3, time, held_keys, mouse, clamp
-from math import sin, cos, pi, atan2, degrees
+from ursina import Entity, camera, color, Vec3, time, held_keys, mouse, clamp
+from math import sin, cos, pi, atan2, degrees, sqrt
 from functools import lru_cache
 
+from engine import bootstrap, Colors, Physics, combine
+
+def _fast_normalize3(v):
+    """Scale a non-zero vector to unit length with a single reciprocal sqrt"""
+    return v * (1.0 / sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2]))
+
 # Initialize application with explicit 60 FPS setting
-app = Ursina(
-    vsync=True,
-    development_mode=False,
-    size=(1280, 720),
-    borderless=False,
-    fullscreen=False
-)
+app = bootstrap("B3313 Engine - Comet Observatory (Stable)", vsync=True)
 
 # Set explicit target frame rate
 app.set_frame_rate(60)
 
-# Window configuration
-window.title = "B3313 Engine - Comet Observatory (Stable)"
-window.color = color.rgb(8, 10, 22)
-window.fps_counter.enabled = True
-window.entity_counter.enabled = True
-
-# Color Constants
-class Colors:
-    OBSERVATORY = color.rgba(210, 230, 255, 255)
-    ENGINE = color.rgba(90, 90, 160, 240)
-    GLASS = color.rgba(160, 220, 255, 120)
-    STAR = color.yellow
-    DOME_RED = color.rgb(200, 50, 50)
-    DOME_GREEN = color.rgb(50, 150, 50)
-    DOME_CYAN = color.rgb(50, 150, 200)
-    METAL = color.rgb(100, 100, 100)
-    ENERGY = color.rgb(100, 150, 255)
-
-# Physics Constants
-class Physics:
-    GRAVITY = 25
-    PLANET_CENTER = Vec3(0, 0, 0)
-    PLANET_RADIUS = 32
-    PLAYER_HEIGHT = 2
-    PLAYER_RADIUS = 0.5
-    JUMP_HEIGHT = 5
-    MOVE_SPEED = 7
-    AIR_CONTROL = 0.8
-    FRICTION = 0.9
-
 class SphericalPlayer(Entity):
+    # Shared read-only idle movement vector; never mutate in place
+    _ZERO = Vec3(0, 0, 0)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.speed = Physics.MOVE_SPEED
@@ -72,7 +45,7 @@ class SphericalPlayer(Entity):
         self._cached_normal = None
 
     def get_surface_normal(self, pos):
-        return (pos - Physics.PLANET_CENTER).normalized()
+        return _fast_normalize3(pos - Physics.PLANET_CENTER)
 
     def update(self):
         # Get surface normal
@@ -88,25 +61,30 @@ class SphericalPlayer(Entity):
         )
         
         # Movement input
-        move_x = held_keys['d'] - held_keys['a']
-        move_z = held_keys['w'] - held_keys['s']
-        
-        # Project camera directions onto tangent plane
-        camera_forward = camera.forward
-        camera_right = camera.right
-        
-        tangent_forward = (camera_forward - surface_normal * surface_normal.dot(camera_forward)).normalized()
-        tangent_right = (camera_right - surface_normal * surface_normal.dot(camera_right)).normalized()
-        
+        hk = held_keys
+        move_x = hk['d'] - hk['a']
+        move_z = hk['w'] - hk['s']
+        
+        # Tangent basis from one cross product: right = n x forward,
+        # forward = right x n (already unit length, no second normalize)
+        tangent_right = surface_normal.cross(camera.forward)
+        tr_len = tangent_right.length()
+        if tr_len > 1e-6:
+            tangent_right *= 1 / tr_len
+        else:
+            # Looking straight along the normal, fall back to camera.right
+            camera_right = camera.right
+            tangent_right = _fast_normalize3(camera_right - surface_normal * surface_normal.dot(camera_right))
+        tangent_forward = tangent_right.cross(surface_normal)
+
         # Calculate movement
-        move_amount = Vec3(0, 0, 0)
+        move_amount = self._ZERO
         if move_x != 0 or move_z != 0:
-            move_direction = (tangent_forward * move_z + tangent_right * move_x).normalized()
+            move_direction = _fast_normalize3(tangent_forward * move_z + tangent_right * move_x)
             move_amount = move_direction * self.speed * (Physics.AIR_CONTROL if not self.grounded else 1.0)
         
         # Apply physics
-        gravity_force = -surface_normal * Physics.GRAVITY
-        self.velocity += gravity_force * time.dt
+        self.velocity -= surface_normal * (Physics.GRAVITY * time.dt)
         
         # Apply movement
         self.position += (self.velocity + move_amount) * time.dt
@@ -116,12 +94,13 @@ class SphericalPlayer(Entity):
         camera.look_at(self.position + surface_normal * self.spring_arm_length)
         
         # Ground collision and correction
-        distance_from_center = self.position.length()
         target_distance = Physics.PLANET_RADIUS + self.height / 2
+        p = self.position
+        dist_sq = p.x * p.x + p.y * p.y + p.z * p.z
         
-        if distance_from_center <= target_distance:
+        if dist_sq <= target_distance * target_distance:
             self.grounded = True
-            self.position = self.position.normalized() * target_distance
+            self.position = p * (target_distance / sqrt(dist_sq))
             radial_velocity = self.velocity.dot(surface_normal)
             if radial_velocity < 0:
                 self.velocity -= surface_normal * radial_velocity
@@ -159,19 +138,22 @@ class ObservatoryWorld:
         )
         self.entities.append(self.main_floor)
         
-        # Decorative cubes
+        # Decorative cubes (batched into one mesh under the floor)
+        cubes = []
         for i in range(8):
             angle = i * (360 / 8)
             dir_vec = Vec3(cos(radians(angle)), 0, sin(radians(angle)))
             position = dir_vec * (Physics.PLANET_RADIUS - 0.2)
-            Entity(
+            cubes.append(Entity(
                 model='cube',
                 color=Colors.METAL,
                 scale=(1.5, 0.8, 1.5),
                 position=position,
-                rotation=(0, -angle, 0),
-                parent=self.main_floor
-            )
+                rotation=(0, -angle, 0)
+            ))
+        self.decor_cubes = combine(cubes, name="decor_cubes")
+        self.decor_cubes.parent = self.main_floor
+        self.entities.append(self.decor_cubes)
         
         # Domes
         dome_configs = [
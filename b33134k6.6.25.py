@@ -4,81 +4,86 @@ Combined build using EZEngine framework as base.
 Single-file Python project: 1.py (Patched Build)
 No external PNG dependencies; uses procedural geometry and mesh generation.
 """
-from ursina import Ursina, Entity, camera, window, color, Vec3, Vec2, time, held_keys, mouse, clamp, DirectionalLight, AmbientLight
-from ursina.mesh_importer import combine
+from ursina import Entity, camera, color, Vec3, Vec2, time, mouse, clamp, DirectionalLight, AmbientLight
 # from ursina.prefabs.first_person_controller import FirstPersonController <- Replaced with custom controller
-from ursina import Mesh
+from ursina import Shader
+from panda3d.core import Quat, lookAt, Geom, GeomNode, GeomTriangles, GeomPoints, GeomVertexData, GeomVertexFormat, NodePath
+from panda3d.core import GeomVertexArrayFormat, InternalName, BoundingSphere
 from math import sin, cos, pi, radians, sqrt, atan2, degrees
 from functools import lru_cache
 import random
+import numpy as np
+
+import engine
+from engine import bootstrap, Colors, combine, FramePacer, njit
 
 # ----------------------
 # Engine Bootstrap
 # ----------------------
-app = Ursina(
-    vsync=True, # Set to True for smoother experience, False for max FPS
-    development_mode=False,
-    size=(1280,720),
-    borderless=False,
-    fullscreen=False
-)
-window.title = "EZEngine - Comet Observatory (Patched)"
-window.color = color.rgb(8,10,22)
-window.fps_counter.enabled = True
-window.entity_counter.enabled = True
+app = bootstrap("EZEngine - Comet Observatory (Patched)") # Frame rate is capped by FramePacer below instead of vsync
 mouse.locked = True
 
-# ----------------------
-# Color Palette
-# ----------------------
-OBS_COLOR    = color.rgba(210,230,255,255)
-ENGINE_COL   = color.rgba(90,90,160,240)
-GLASS_COL    = color.rgba(160,220,255,120)
-STAR_COLOR   = color.yellow
-DOME_RED     = color.rgba(200,50,50)
-DOME_GREEN   = color.rgba(50,150,50)
-DOME_CYAN    = color.rgba(50,150,200)
-METAL_COLOR  = color.rgba(100,100,100)
-ENERGY_COLOR = color.rgba(100,150,255)
-
 # ----------------------
 # Physics & Planet
 # ----------------------
-GRAVITY      = 25
-PLANET_CENTER= Vec3(0,0,0)
-SURFACE_R    = 32
-PLAYER_HEIGHT= 2
-PLAYER_SPEED = 7
-AIR_CONTROL  = 0.5
-FRICTION     = 0.9
+class Physics(engine.Physics):
+    AIR_CONTROL = 0.5
+    JUMP_HEIGHT = 8.0
+
+# Module-level copies: the Numba kernel freezes globals in as compile-time constants
+GRAVITY      = Physics.GRAVITY
+PLANET_CENTER= Physics.PLANET_CENTER
+SURFACE_R    = Physics.PLANET_RADIUS
+PLAYER_HEIGHT= Physics.PLAYER_HEIGHT
+PLAYER_SPEED = Physics.MOVE_SPEED
+AIR_CONTROL  = Physics.AIR_CONTROL
+FRICTION     = Physics.FRICTION
 
 # ----------------------
 # Utility: Low-poly sphere mesh generator
 # ----------------------
 @lru_cache(maxsize=1)
 def create_lowpoly_sphere(segments=8):
-    verts=[]; tris=[]
-    for i in range(segments + 1):
-        lat = pi * i / segments
-        for j in range(segments + 1): # Use segments+1 to wrap texture coords correctly
-            lon = 2 * pi * j / segments
-            x = sin(lat) * cos(lon)
-            y = cos(lat)
-            z = sin(lat) * sin(lon)
-            verts.append(Vec3(x, y, z))
-
-    for i in range(segments):
-        for j in range(segments):
-            a = i * (segments + 1) + j
-            b = a + 1
-            c = (i + 1) * (segments + 1) + j
-            d = c + 1
-            tris.extend([(a, c, b), (b, c, d)])
-    # The original function was missing normals and uvs, which can cause lighting issues.
-    # We can let Ursina generate them.
-    return Mesh(vertices=verts, triangles=tris, mode='triangle', static=True)
-
-lowpoly_sphere = create_lowpoly_sphere(segments=12) # Increased segments for a rounder look
+    # Vectorized lat/lon grid: trig runs in NumPy instead of per-vertex Python calls
+    lat = np.linspace(0, pi, segments + 1) # segments+1 to wrap texture coords correctly
+    lon = np.linspace(0, 2 * pi, segments + 1)
+    LAT, LON = np.meshgrid(lat, lon, indexing='ij')
+    x = np.sin(LAT) * np.cos(LON)
+    y = np.cos(LAT)
+    z = np.sin(LAT) * np.sin(LON)
+    verts = np.stack([x, y, z], -1).reshape(-1, 3)
+    uvs = np.stack([LON / (2 * pi), 1 - LAT / pi], -1).reshape(-1, 2)
+    # Interleaved rows matching GeomVertexFormat.get_v3n3t2(); on a unit sphere normal == position
+    rows = np.concatenate([verts, verts, uvs], axis=1).astype(np.float32)
+
+    i, j = np.mgrid[:segments, :segments]
+    a = i * (segments + 1) + j
+    b = a + 1
+    c = a + segments + 1
+    d = c + 1
+    tris = np.stack([a, c, b, b, c, d], -1).reshape(-1).astype(np.uint16)
+
+    # Write both buffers straight into Panda3D's arrays (one memcpy each) instead of
+    # going through Mesh's per-vertex Python loop
+    vdata = GeomVertexData('lowpoly_sphere', GeomVertexFormat.get_v3n3t2(), Geom.UH_static)
+    vdata.unclean_set_num_rows(len(rows))
+    memoryview(vdata.modify_array(0)).cast('B').cast('f')[:] = rows.ravel()
+
+    prim = GeomTriangles(Geom.UH_static)
+    prim.set_index_type(Geom.NT_uint16)
+    indices = prim.modify_vertices()
+    indices.unclean_set_num_rows(len(tris))
+    memoryview(indices).cast('B').cast('H')[:] = tris
+
+    geom = Geom(vdata)
+    geom.add_primitive(prim)
+    return geom
+
+def lowpoly_sphere():
+    # Every entity needs its own node, but they all share one Geom (and one vertex buffer)
+    node = GeomNode('lowpoly_sphere')
+    node.add_geom(create_lowpoly_sphere(segments=12)) # Increased segments for a rounder look
+    return NodePath(node)
 
 # ----------------------
 # World Setup: Comet Observatory
@@ -90,46 +95,48 @@ class ObservatoryWorld:
         self.build()
     def build(self):
         # planet base
-        floor = Entity(model=lowpoly_sphere, scale=SURFACE_R*2, color=OBS_COLOR, double_sided=True, collider='sphere')
+        floor = Entity(model=lowpoly_sphere(), scale=SURFACE_R*2, color=Colors.OBSERVATORY, double_sided=True, collider='sphere')
         self.entities.append(floor)
         # decor cubes
         decor=[]
         for i in range(8):
             ang=i*(360/8)
             d=Vec3(cos(radians(ang)),0,sin(radians(ang)))
-            e=Entity(model='cube', color=METAL_COLOR, scale=(1.5,0.8,1.5), position=d*(SURFACE_R-0.2), rotation=(0,ang,0))
+            e=Entity(model='cube', color=Colors.METAL, scale=(1.5,0.8,1.5), position=d*(SURFACE_R-0.2), rotation=(0,ang,0))
             e.look_at(e.position * 2, up=e.position.normalized()) # Align to surface
             decor.append(e)
-        combine(decor)
+        self.decor=combine(decor, name='decor_cubes')
+        self.entities.append(self.decor)
         # domes + warp pads
-        for dir_vec, col in [(Vec3(1,1,0),DOME_RED),(Vec3(-1,1,0),DOME_GREEN),(Vec3(0,1,1),DOME_CYAN)]:
+        for dir_vec, col in [(Vec3(1,1,0),Colors.DOME_RED),(Vec3(-1,1,0),Colors.DOME_GREEN),(Vec3(0,1,1),Colors.DOME_CYAN)]:
             up=dir_vec.normalized()
             pos=up*SURFACE_R
-            dome=Entity(model=lowpoly_sphere, scale=8, color=col, position=pos)
+            dome=Entity(model=lowpoly_sphere(), scale=8, color=col, position=pos)
             pad=Entity(model='cylinder', scale=(3.6,0.4,3.6), color=col, position=pos-up*0.2)
             dome.look_at(dome.position*2, up=up)
             pad.look_at(pad.position*2, up=up)
             self.entities+= [dome,pad]
         # central star
-        star=Entity(model=lowpoly_sphere, scale=2, color=STAR_COLOR, position=(0,SURFACE_R+8,0), unlit=True)
+        star=Entity(model=lowpoly_sphere(), scale=2, color=Colors.STAR, position=(0,SURFACE_R+8,0), unlit=True)
         self.entities.append(star)
         self.animated.append(star)
         # engine room
         base_pos = Vec3(0,-(SURFACE_R+5),0)
-        base=Entity(model='cylinder', color=ENGINE_COL, scale=(14,0.8,14), position=base_pos)
-        core=Entity(model='cylinder', color=METAL_COLOR, scale=(3,10,3), position=base_pos + Vec3(0,5,0))
+        base=Entity(model='cylinder', color=Colors.ENGINE, scale=(14,0.8,14), position=base_pos)
+        core=Entity(model='cylinder', color=Colors.METAL, scale=(3,10,3), position=base_pos + Vec3(0,5,0))
         self.entities+=[base,core]
         supports=[]
         for ang in range(0,360,60):
-            s=Entity(model='cube', color=METAL_COLOR, scale=(0.6,10.2,0.6), position=core.position, rotation=(0,ang,0))
+            s=Entity(model='cube', color=Colors.METAL, scale=(0.6,10.2,0.6), position=core.position, rotation=(0,ang,0))
             supports.append(s)
-        combine(supports)
+        self.supports=combine(supports, name='engine_supports')
+        self.entities.append(self.supports)
         # energy nodes
         self.nodes=[]
         for i in range(5):
             th=i*(2*pi/5)
             x=7*cos(th); z=7*sin(th)
-            node=Entity(model=lowpoly_sphere, color=ENERGY_COLOR, unlit=True, scale=0.8, position=(x,base_pos.y+2,z))
+            node=Entity(model=lowpoly_sphere(), color=Colors.ENERGY, unlit=True, scale=0.8, position=(x,base_pos.y+2,z))
             self.nodes.append(node)
             self.entities.append(node)
         # lighting
@@ -138,9 +145,50 @@ class ObservatoryWorld:
 
 world = ObservatoryWorld()
 
+# ----------------------------------------------------
+# Player physics kernel (compiled with Numba when available)
+# ----------------------------------------------------
+@njit(cache=True, fastmath=True)
+def physics_step(pos, vel, fwd, right, up, move_x, move_z, idle, dt, grounded, speed):
+    """Advance pos/vel in place by one frame and return the new grounded flag."""
+    # Project movement input onto the current ground plane
+    move_dir = fwd * move_z + right * move_x
+    move_dir -= up * (move_dir[0]*up[0] + move_dir[1]*up[1] + move_dir[2]*up[2])
+    move_len = np.sqrt(move_dir[0]*move_dir[0] + move_dir[1]*move_dir[1] + move_dir[2]*move_dir[2])
+    if move_len > 0:
+        move_dir /= move_len
+
+    if grounded:
+        # On the ground, interpolate towards the target velocity for a responsive feel
+        vel[:] = vel * 0.8 + move_dir * (speed * 0.2)
+        # Apply friction when no keys are pressed
+        if idle:
+            vel *= FRICTION
+    else:
+        # In the air, apply a smaller force
+        vel += move_dir * (speed * AIR_CONTROL * dt)
+
+    # Gravity, then integrate
+    vel -= up * (GRAVITY * dt)
+    pos += vel * dt
+
+    # Ground collision and snapping
+    dist_from_center = np.sqrt(pos[0]*pos[0] + pos[1]*pos[1] + pos[2]*pos[2])
+    if dist_from_center <= SURFACE_R:
+        pos *= SURFACE_R / dist_from_center
+        # Remove any velocity component pointing into the ground
+        radial_v = vel[0]*up[0] + vel[1]*up[1] + vel[2]*up[2]
+        if radial_v < 0:
+            vel -= up * radial_v
+        return True
+    return False
+
 # ----------------------------------------------------
 # Player Controller: Spherical gravity (Corrected)
 # ----------------------------------------------------
+# Movement keys are tracked as one bitmask, flipped by key press/release events
+KEY_BITS = {'w': 1, 'a': 2, 's': 4, 'd': 8, 'space': 16}
+
 class SphericalController(Entity):
     def __init__(self, **kwargs):
         super().__init__(origin_y=-0.5, **kwargs) # Set origin to feet
@@ -154,61 +202,67 @@ class SphericalController(Entity):
         
         self.velocity = Vec3(0,0,0)
         self.grounded = True
-        self.jump_height = 8.0
+        self.jump_height = Physics.JUMP_HEIGHT
         self.speed = PLAYER_SPEED
         self.mouse_sensitivity = Vec2(40, 40)
+        self.key_mask = 0
+        self._orientation = Quat()
+
+        # Scratch buffers reused by physics_step every frame
+        self._pos = np.empty(3)
+        self._vel = np.empty(3)
+        self._fwd = np.empty(3)
+        self._right = np.empty(3)
+        self._up = np.empty(3)
 
     def update(self):
-        # 1. Align player's rotation to the planet's surface normal
-        self.up = (self.position - PLANET_CENTER).normalized()
-        self.rotation_y += mouse.velocity[0] * self.mouse_sensitivity[1]
-        self.look_at(self.position + self.forward, up=self.up)
+        mouse_x, mouse_y = mouse.velocity[0], mouse.velocity[1]
+        keys = self.key_mask
+        move_x = ((keys >> 3) & 1) - ((keys >> 1) & 1) # d - a
+        move_z = (keys & 1) - ((keys >> 2) & 1)         # w - s
+        idle = keys == 0
+        # Grounded, no keys and no residual velocity: the physics step is a fixed point
+        at_rest = idle and self.grounded and self.velocity.length_squared() < 1e-6
+
+        # 1. Align player's rotation to the planet's surface normal.
+        # Yaw is applied to the forward axis directly, then one quaternion is built from
+        # (forward, up) instead of writing rotation_y and letting look_at() overwrite it.
+        if mouse_x or not at_rest:
+            up = (self.position - PLANET_CENTER).normalized()
+            forward = self.forward
+            if mouse_x:
+                yaw = radians(mouse_x * self.mouse_sensitivity[1])
+                forward = forward * cos(yaw) + self.right * sin(yaw)
+            lookAt(self._orientation, forward, up)
+            self.setQuat(self._orientation)
         
         # 2. Camera look up/down
-        self.camera_pivot.rotation_x -= mouse.velocity[1] * self.mouse_sensitivity[0]
-        self.camera_pivot.rotation_x = clamp(self.camera_pivot.rotation_x, -90, 90)
+        if mouse_y:
+            self.camera_pivot.rotation_x -= mouse_y * self.mouse_sensitivity[0]
+            self.camera_pivot.rotation_x = clamp(self.camera_pivot.rotation_x, -90, 90)
 
-        # 3. Movement
-        move_input = (self.forward * (held_keys['w'] - held_keys['s']) +
-                      self.right * (held_keys['d'] - held_keys['a']))
-        
-        # Project movement input onto the current ground plane
-        move_direction = move_input - self.up * move_input.dot(self.up)
-        if move_direction.length() > 0:
-            move_direction.normalize()
+        if at_rest:
+            return
 
-        if self.grounded:
-            # On the ground, directly influence velocity for a responsive feel
-            target_velocity = move_direction * self.speed
-            # Interpolate towards target velocity
-            self.velocity = self.velocity * 0.8 + target_velocity * 0.2
-            # Apply friction when no keys are pressed
-            if not any(held_keys.values()):
-                self.velocity *= FRICTION
-        else:
-            # In the air, apply a smaller force
-            self.velocity += move_direction * self.speed * AIR_CONTROL * time.dt
-
-        # 4. Gravity
-        self.velocity += -self.up * GRAVITY * time.dt
-
-        # 5. Apply final velocity
-        self.position += self.velocity * time.dt
-        
-        # 6. Ground collision and snapping
-        dist_from_center = self.position.length()
-        if dist_from_center <= SURFACE_R:
-            self.grounded = True
-            self.position = self.position.normalized() * SURFACE_R
-            
-            # Remove any velocity component pointing into the ground
-            radial_v = self.velocity.dot(self.up)
-            if radial_v < 0:
-                self.velocity -= self.up * radial_v
-        else:
-            self.grounded = False
+        # 3-6. Movement, gravity, integration and ground snapping
+        self._pos[:] = self.position
+        self._vel[:] = self.velocity
+        self._fwd[:] = self.forward
+        self._right[:] = self.right
+        self._up[:] = up
+        self.grounded = physics_step(
+            self._pos, self._vel, self._fwd, self._right, self._up,
+            move_x, move_z, idle, time.dt, self.grounded, self.speed
+        )
+        self.position = Vec3(*self._pos)
+        self.velocity = Vec3(*self._vel)
 
     def input(self, key):
+        if key in KEY_BITS:
+            self.key_mask |= KEY_BITS[key]
+        elif key.endswith(' up') and key[:-3] in KEY_BITS:
+            self.key_mask &= ~KEY_BITS[key[:-3]]
+
         if key == 'space':
             self.jump()
 
@@ -224,15 +278,78 @@ player.position=(0,SURFACE_R,0)
 # ----------------------
 # Animation & Stars
 # ----------------------
-stars=[]
-# Use a starfield Entity for performance instead of drawing dots every frame
-starfield = Entity()
-star_mesh = Mesh(mode='point', thickness=.05)
-for i in range(500):
-    pos = Vec3(random.uniform(-1,1),random.uniform(-1,1),random.uniform(-1,1)).normalized() * 100
-    star_mesh.vertices.append(pos)
-    star_mesh.colors.append(color.white)
-starfield.model = star_mesh
+# Use a starfield Entity for performance instead of drawing dots every frame.
+# The slow drift is done in the vertex shader from Panda3D's osg_FrameTime, so the
+# CPU never touches the starfield transform after startup.
+# Every star sits on the radius-100 shell, so only its two angles are stored, as
+# Q1.31 fixed point (angle / pi): 8 bytes per star instead of a 12-byte position.
+starfield_shader = Shader(name='starfield_shader', language=Shader.GLSL, vertex='''#version 140
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+uniform float osg_FrameTime;
+in ivec2 angles;
+
+const float DEG = 0.017453292;
+const float Q31 = 1.0 / 2147483648.0;
+
+// sin(x * pi) for x in [-1, 1], quadratic approximation
+float sin_pi(float x) {
+    return 4.0 * (x - sign(x) * x * x);
+}
+
+// cos(x * pi) = sin((x + 0.5) * pi), wrapped back into [-1, 1)
+float cos_pi(float x) {
+    x += 0.5;
+    return sin_pi(x - 2.0 * step(1.0, x));
+}
+
+void main() {
+    float theta = float(angles.x) * Q31;  // longitude, [-1, 1)
+    float phi = float(angles.y) * Q31;    // colatitude, [0, 1]
+    float sp = sin_pi(phi);
+    vec3 dir = normalize(vec3(sp * cos_pi(theta), cos_pi(phi), sp * sin_pi(theta))) * 100.0;
+
+    // Same drift as rotation_y += dt*0.1 and rotation_x += dt*0.05 (degrees)
+    float yaw = osg_FrameTime * 0.1 * DEG;
+    float pitch = osg_FrameTime * 0.05 * DEG;
+    float cy = cos(yaw), sy = sin(yaw), cp = cos(pitch), sn = sin(pitch);
+    mat3 rot_y = mat3(cy, 0.0, -sy,  0.0, 1.0, 0.0,  sy, 0.0, cy);
+    mat3 rot_x = mat3(1.0, 0.0, 0.0,  0.0, cp, sn,  0.0, -sn, cp);
+    gl_Position = p3d_ModelViewProjectionMatrix * vec4(rot_y * rot_x * dir, 1.0);
+}
+''',
+fragment='''#version 140
+
+uniform vec4 p3d_ColorScale;
+out vec4 fragColor;
+
+void main() {
+    fragColor = p3d_ColorScale;
+}
+''')
+
+# Normalized Gaussian samples are uniform on the sphere
+star_dirs = np.random.standard_normal((500, 3))
+star_dirs /= np.linalg.norm(star_dirs, axis=1, keepdims=True)
+star_angles = np.stack([np.arctan2(star_dirs[:, 2], star_dirs[:, 0]), np.arccos(star_dirs[:, 1])], axis=-1) / pi
+star_angles = np.clip(np.round(star_angles * 2**31), -2**31, 2**31 - 1).astype(np.int32)
+
+star_array = GeomVertexArrayFormat()
+star_array.add_column(InternalName.make('angles'), 2, Geom.NT_int32, Geom.C_other)
+star_vdata = GeomVertexData('starfield', GeomVertexFormat.register_format(star_array), Geom.UH_static)
+star_vdata.unclean_set_num_rows(len(star_angles))
+memoryview(star_vdata.modify_array(0)).cast('B').cast('i')[:] = star_angles.ravel()
+# Screen-space points: the shader places them, so Panda must not expand them into quads on the CPU
+star_prim = GeomPoints(Geom.UH_static)
+star_prim.add_next_vertices(len(star_angles))
+star_geom = Geom(star_vdata)
+star_geom.add_primitive(star_prim)
+# There is no position column for Panda3D to compute bounds from
+star_geom.set_bounds(BoundingSphere((0, 0, 0), 100))
+star_node = GeomNode('starfield')
+star_node.add_geom(star_geom)
+starfield = Entity(model=NodePath(star_node), shader=starfield_shader)
+starfield.set_render_mode_thickness(1)
 
 
 # update loop
@@ -249,14 +366,11 @@ def update():
     # Energy nodes pulse
     for i,node in enumerate(world.nodes):
         node.scale=0.8 + sin(t*3 + node_offsets[i])*0.15
-        
-    # Rotate starfield for a dynamic background
-    starfield.rotation_y += time.dt * 0.1
-    starfield.rotation_x += time.dt * 0.05
 
 
 # ----------------------
 # Launch
 # ----------------------
+frame_pacer = FramePacer(fps=60)
 print("EZEngine Comet Observatory - Use WASD + Mouse. Jump: Space.")
 app.run()
@@ -1,63 +1,59 @@
 from ursina import (
-    Ursina, Entity, camera, window, color, held_keys, mouse, time, clamp,
+    Entity, camera, window, color, held_keys, mouse, time, clamp,
     Vec2, Vec3,
-    Mesh, DirectionalLight, AmbientLight,
-    destroy,
-    Sky
+    DirectionalLight, AmbientLight,
+    Sky, Shader
 )
-from math import sin, cos, pi, radians, sqrt, atan2, degrees
+from panda3d.core import OmniBoundingVolume, PTA_float
+from math import pi, sqrt, atan2, degrees
 from functools import lru_cache
 import time as pytime
+import numpy as np
 
-# --------- combine() compatibility fix ---------
-def combine(entities, name=None):
-    """Simplified combine function for compatibility"""
-    if not entities:
-        return None
-    # Create a parent entity to hold all others
-    parent = Entity(name=name or "combined")
-    for e in entities:
-        e.parent = parent
-    return parent
+from engine import bootstrap, Colors, Physics, combine, FramePacer, PerformanceMonitor
 
 # 🚀 Engine Bootstrap
-app = Ursina(
-    vsync=True,
-    development_mode=False,
-    size=(1280, 720),
-    borderless=False,
-    fullscreen=False
-)
-
-# Window configuration
-window.title = "B3313 Engine - Comet Observatory (Stable)"
-window.color = color.rgb(8, 10, 22)
-window.fps_counter.enabled = True
-window.entity_counter.enabled = True
-
-# 🎨 Color Constants
-class Colors:
-    OBSERVATORY = color.rgba(210, 230, 255, 255)
-    ENGINE = color.rgba(90, 90, 160, 240)
-    GLASS = color.rgba(160, 220, 255, 120)
-    STAR = color.yellow
-    DOME_RED = color.rgb(200, 50, 50)
-    DOME_GREEN = color.rgb(50, 150, 50)
-    DOME_CYAN = color.rgb(50, 150, 200)
-    METAL = color.rgb(100, 100, 100)
-    ENERGY = color.rgb(100, 150, 255)
-
-# 🌍 Physics Constants
-class Physics:
-    GRAVITY = 25
-    PLANET_CENTER = Vec3(0, 0, 0)
-    PLANET_RADIUS = 32
-    PLAYER_HEIGHT = 2
-    PLAYER_RADIUS = 0.5
-    JUMP_HEIGHT = 5
-    MOVE_SPEED = 7
-    AIR_CONTROL = 0.8
-    FRICTION = 0.9
+app = bootstrap("B3313 Engine - Comet Observatory (Stable)")  # vsync off: paced by FramePacer
+
+@lru_cache(maxsize=8)
+def _precomputed_circle(n):
+    """(cos, sin) pairs for n evenly spaced angles, shared by every ring of props"""
+    theta = np.arange(n) * (2 * pi / n)
+    circle = np.stack([np.cos(theta), np.sin(theta)], -1)
+    circle.setflags(write=False)
+    return circle
+
+# Dome placements are literals, so normalize their directions once at import
+DOME_CONFIGS = [
+    (Vec3(1, 1, 0).normalized(), Colors.DOME_RED),
+    (Vec3(-1, 1, 0).normalized(), Colors.DOME_GREEN),
+    (Vec3(0, 1, 1).normalized(), Colors.DOME_CYAN)
+]
+
+# 🔆 Energy nodes: one sphere drawn ENERGY_NODE_COUNT times via hardware instancing
+ENERGY_NODE_COUNT = 5
+energy_node_shader = Shader(name='energy_node_shader', language=Shader.GLSL, vertex=f'''#version 140
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+in vec4 p3d_Vertex;
+
+uniform vec3 offsets[{ENERGY_NODE_COUNT}];
+uniform float scales[{ENERGY_NODE_COUNT}];
+
+void main() {{
+    vec3 v = p3d_Vertex.xyz * scales[gl_InstanceID] + offsets[gl_InstanceID];
+    gl_Position = p3d_ModelViewProjectionMatrix * vec4(v, 1.0);
+}}
+''',
+fragment='''#version 140
+
+uniform vec4 p3d_ColorScale;
+out vec4 fragColor;
+
+void main() {
+    fragColor = p3d_ColorScale;
+}
+''')
 
 class SphericalPlayer(Entity):
     def __init__(self, **kwargs):
@@ -70,7 +66,7 @@ class SphericalPlayer(Entity):
         self.velocity = Vec3(0, 0, 0)
         self.grounded = False
         self.start_pos = self.position.copy()
-        self.collider = 'sphere'
+        # No collider: ground contact is the analytic radius check in update()
 
         # Camera setup
         self.camera_pivot = Entity(parent=self, y=self.height/2)
@@ -83,63 +79,85 @@ class SphericalPlayer(Entity):
         mouse.locked = True
         self.mouse_sensitivity = Vec2(100, 100)
 
-    @lru_cache(maxsize=128)
-    def get_surface_normal(self, pos_tuple):
-        """Cached surface normal calculation"""
-        pos = Vec3(*pos_tuple)
-        return (pos - Physics.PLANET_CENTER).normalized()
-
     def update(self):
-        # Get surface normal (with caching)
-        pos_tuple = (round(self.position.x, 2), round(self.position.y, 2), round(self.position.z, 2))
-        surface_normal = self.get_surface_normal(pos_tuple)
-        
+        # Physics runs on plain floats; Vec3s are only built where Panda3D needs one
+        dt = time.dt
+        px, py, pz = self.position
+        vx, vy, vz = self.velocity
+
+        # Surface normal (cheaper to recompute than to cache: the position changes every frame)
+        cx, cy, cz = Physics.PLANET_CENTER
+        nx, ny, nz = px - cx, py - cy, pz - cz
+        inv_len = 1 / sqrt(nx * nx + ny * ny + nz * nz)
+        nx *= inv_len
+        ny *= inv_len
+        nz *= inv_len
+
         # Orient player to surface and handle mouse look
-        self.look_at(self.position + surface_normal, Physics.PLANET_CENTER)
-        self.rotation_y += mouse.velocity[0] * self.mouse_sensitivity.x * time.dt
+        self.look_at(Vec3(px + nx, py + ny, pz + nz), Physics.PLANET_CENTER)
+        self.rotation_y += mouse.velocity[0] * self.mouse_sensitivity.x * dt
 
         # Mouse look (camera pitch)
         self.camera_pivot.rotation_x = clamp(
-            self.camera_pivot.rotation_x - mouse.velocity[1] * self.mouse_sensitivity.y * time.dt,
+            self.camera_pivot.rotation_x - mouse.velocity[1] * self.mouse_sensitivity.y * dt,
             -90, 90
         )
 
         # Movement input
-        move_input = Vec3(
-            held_keys['d'] - held_keys['a'],
-            0,
-            held_keys['w'] - held_keys['s']
-        ).normalized()
-
-        move_direction = self.forward * move_input.z + self.right * move_input.x
-        move_amount = move_direction * self.speed * (Physics.AIR_CONTROL if not self.grounded else 1.0)
-        
+        hk = held_keys
+        input_x = hk['d'] - hk['a']
+        input_z = hk['w'] - hk['s']
+        moving = input_x or input_z
+
+        mx = my = mz = 0.0
+        if moving:
+            k = self.speed * (Physics.AIR_CONTROL if not self.grounded else 1.0) / sqrt(input_x * input_x + input_z * input_z)
+            fx, fy, fz = self.forward
+            rx, ry, rz = self.right
+            mx = (fx * input_z + rx * input_x) * k
+            my = (fy * input_z + ry * input_x) * k
+            mz = (fz * input_z + rz * input_x) * k
+
         # Apply physics
-        gravity_force = -surface_normal * Physics.GRAVITY
-        self.velocity += gravity_force * time.dt
+        g = Physics.GRAVITY * dt
+        vx -= nx * g
+        vy -= ny * g
+        vz -= nz * g
 
         # Apply movement
-        self.position += (self.velocity + move_amount) * time.dt
+        px += (vx + mx) * dt
+        py += (vy + my) * dt
+        pz += (vz + mz) * dt
 
         # Ground collision and correction
-        distance_from_center = self.position.length()
         target_distance = Physics.PLANET_RADIUS + self.height / 2
+        dist_sq = px * px + py * py + pz * pz
 
-        if distance_from_center <= target_distance:
+        if dist_sq <= target_distance * target_distance:
             self.grounded = True
-            self.position = self.position.normalized() * target_distance
+            snap = target_distance / sqrt(dist_sq)
+            px *= snap
+            py *= snap
+            pz *= snap
 
             # Cancel radial velocity
-            radial_velocity = self.velocity.dot(surface_normal)
+            radial_velocity = vx * nx + vy * ny + vz * nz
             if radial_velocity < 0:
-                self.velocity -= surface_normal * radial_velocity
+                vx -= nx * radial_velocity
+                vy -= ny * radial_velocity
+                vz -= nz * radial_velocity
 
             # Apply friction when not moving
-            if move_input.length() == 0:
-                self.velocity *= Physics.FRICTION
+            if not moving:
+                vx *= Physics.FRICTION
+                vy *= Physics.FRICTION
+                vz *= Physics.FRICTION
         else:
             self.grounded = False
 
+        self.position = Vec3(px, py, pz)
+        self.velocity = Vec3(vx, vy, vz)
+
     def jump(self):
         if self.grounded:
             self.velocity += self.up * self.jump_height
@@ -163,13 +181,12 @@ class ObservatoryWorld:
         Sky(texture='sky_default', color=color.white * 0.8)
 
         # Main planetoid
-        self.main_floor = Entity(
+        main_floor = Entity(
             model='sphere',
             scale=Physics.PLANET_RADIUS * 2,
-            color=Colors.OBSERVATORY,
-            collider='sphere'
+            color=Colors.OBSERVATORY
         )
-        self.entities.append(self.main_floor)
+        self.entities.append(main_floor)
 
         # Create decorative elements
         self.create_decorative_cubes()
@@ -177,40 +194,41 @@ class ObservatoryWorld:
         self.create_central_star()
         self.create_engine_room()
 
+        # Bake everything that never moves into one mesh (the static parts are only
+        # kept as locals: combine destroys them); animated entities get their own
+        # root so their transforms don't invalidate it
+        static_entities = [e for e in self.entities if e not in self.animated_entities]
+        self.static_root = combine(static_entities, name="static_root")
+        self.animated_root = Entity(name="animated_root")
+        for e in self.animated_entities:
+            e.parent = self.animated_root
+        self.entities = [self.static_root, self.animated_root]
+
+        # Pulse parameters as structure-of-arrays: index 0 is the star, the rest are energy nodes.
+        # Kept in float64: t is epoch seconds, which float32 can only resolve to ~256 s
+        self.anim_base = np.array([2.0] + [0.8] * ENERGY_NODE_COUNT)
+        self.anim_amp = np.array([0.2] + [0.15] * ENERGY_NODE_COUNT)
+        self.anim_freq = np.array([2.0] + [3.0] * ENERGY_NODE_COUNT)
+        self.anim_phase = np.concatenate(([0.0], self.node_phases)).astype(np.float64)
+
         # Lighting
         self.setup_lighting()
 
     def create_decorative_cubes(self):
-        cubes = []
-        for i in range(8):
+        radius = Physics.PLANET_RADIUS - 0.2
+        for i, (c, s) in enumerate(_precomputed_circle(8)):
             angle = i * (360 / 8)
-            dir_vec = Vec3(cos(radians(angle)), 0, sin(radians(angle)))
-            position = dir_vec * (Physics.PLANET_RADIUS - 0.2)
-
             cube = Entity(
                 model='cube',
                 color=Colors.METAL,
                 scale=(1.5, 0.8, 1.5),
-                position=position,
+                position=(c * radius, 0, s * radius),
                 rotation=(0, -angle, 0)
             )
-            cubes.append(cube)
-
-        self.decor_cubes = combine(cubes, name="decor_cubes")
-        self.entities.append(self.decor_cubes)
+            self.entities.append(cube)
 
     def create_domes(self):
-        dome_configs = [
-            (Vec3(1, 1, 0), Colors.DOME_RED),
-            (Vec3(-1, 1, 0), Colors.DOME_GREEN),
-            (Vec3(0, 1, 1), Colors.DOME_CYAN)
-        ]
-
-        self.domes = []
-        self.warp_pads = []
-
-        for dir_vec, dome_color in dome_configs:
-            up_vec = dir_vec.normalized()
+        for up_vec, dome_color in DOME_CONFIGS:
             position = up_vec * Physics.PLANET_RADIUS
 
             # Create dome
@@ -221,7 +239,6 @@ class ObservatoryWorld:
                 position=position
             )
             dome.look_at(position * 2)  # Orient away from center
-            self.domes.append(dome)
             self.entities.append(dome)
 
             # Create warp pad
@@ -232,7 +249,6 @@ class ObservatoryWorld:
                 position=position + up_vec * 0.2
             )
             warp_pad.look_at(position * 2)  # Orient same as dome
-            self.warp_pads.append(warp_pad)
             self.entities.append(warp_pad)
 
     def create_central_star(self):
@@ -250,25 +266,24 @@ class ObservatoryWorld:
         engine_pos = Vec3(0, -(Physics.PLANET_RADIUS + 5), 0)
 
         # Base platform
-        self.engine_base = Entity(
+        engine_base = Entity(
             model='cylinder',
             color=Colors.ENGINE,
             scale=(14, 0.8, 14),
             position=engine_pos
         )
-        self.entities.append(self.engine_base)
+        self.entities.append(engine_base)
 
         # Core
-        self.engine_core = Entity(
+        engine_core = Entity(
             model='cylinder',
             color=Colors.METAL,
             scale=(3, 10, 3),
             position=engine_pos + Vec3(0, 5, 0)
         )
-        self.entities.append(self.engine_core)
+        self.entities.append(engine_core)
 
         # Supports
-        supports = []
         for angle in range(0, 360, 60):
             support = Entity(
                 model='cube',
@@ -278,57 +293,48 @@ class ObservatoryWorld:
                 z=5 / 3,
                 rotation_y=angle
             )
-            supports.append(support)
-        
-        self.engine_supports = combine(supports, name="engine_supports")
-        self.entities.append(self.engine_supports)
-
-        # Energy nodes
-        self.energy_nodes = []
-        for i in range(5):
-            theta = i * (2 * pi / 5)
-            x = self.engine_base.scale_x/2 * cos(theta) + self.engine_base.x
-            z = self.engine_base.scale_z/2 * sin(theta) + self.engine_base.z
-            y = self.engine_base.y + 2
-            node = Entity(model='sphere', color=Colors.ENERGY, scale=0.8, position=(x, y, z), unlit=True)
-            self.energy_nodes.append(node)
-            self.entities.append(node)
-            self.animated_entities.append(node)
+            self.entities.append(support)
+
+        # Energy nodes (instanced: offsets/scales live in shader inputs)
+        node_offsets = [
+            Vec3(engine_base.scale_x/2 * c, 0, engine_base.scale_z/2 * s)
+            for c, s in _precomputed_circle(ENERGY_NODE_COUNT)
+        ]
+        self.energy_nodes = Entity(
+            model='sphere',
+            color=Colors.ENERGY,
+            position=engine_base.position + Vec3(0, 2, 0),
+            unlit=True,
+            shader=energy_node_shader
+        )
+        self.energy_nodes.setInstanceCount(ENERGY_NODE_COUNT)
+        # Instances are offset in the shader, so the prototype's bounds can't be used for culling
+        self.energy_nodes.node().setBounds(OmniBoundingVolume())
+        self.energy_nodes.node().setFinal(True)
+        self.energy_nodes.set_shader_input('offsets', node_offsets)
+        # PTA inputs are shared by reference: rewriting the array updates the shader
+        self.node_phases = np.arange(ENERGY_NODE_COUNT, dtype=np.float64)
+        self.node_scales = PTA_float.empty_array(ENERGY_NODE_COUNT)
+        self.energy_nodes.set_shader_input('scales', self.node_scales)
+        self.entities.append(self.energy_nodes)
+        self.animated_entities.append(self.energy_nodes)
 
     def setup_lighting(self):
         DirectionalLight(direction=Vec3(1, -2, -1).normalized(), shadows=False, color=color.white * 0.2)
         AmbientLight(color=color.white * 0.4)
 
     def update_animations(self, t):
-        self.central_star.scale = 2 + sin(t * 2) * 0.2
+        # One vectorized pass over every pulsing object: [star, node 0..n-1]
+        scales = self.anim_base + self.anim_amp * np.sin(t * self.anim_freq + self.anim_phase)
+        self.central_star.scale = float(scales[0])
+        self.node_scales.set_data(scales[1:].astype(np.float32).tobytes())
         self.central_star.rotation_y += time.dt * 10
-        
-        for i, node in enumerate(self.energy_nodes):
-            node.scale = 0.8 + sin(t * 3 + i) * 0.15
-
-class PerformanceMonitor:
-    def __init__(self):
-        self.fps_samples = []
-        self.last_log_time = pytime.time()
-        self.log_interval = 10
-
-    def update(self):
-        if time.dt > 0:
-            self.fps_samples.append(1 / time.dt)
-        current_time = pytime.time()
-        if current_time - self.last_log_time >= self.log_interval:
-            if self.fps_samples:
-                avg_fps = sum(self.fps_samples) / len(self.fps_samples)
-                min_fps = min(self.fps_samples)
-                max_fps = max(self.fps_samples)
-                print(f"[{pytime.strftime('%H:%M:%S')}] FPS Stats - Avg: {avg_fps:.1f}, Min: {min_fps:.1f}, Max: {max_fps:.1f}")
-            self.fps_samples = []
-            self.last_log_time = current_time
 
 # Initialize game components
 world = ObservatoryWorld()
 player = SphericalPlayer(position=(0, Physics.PLANET_RADIUS + Physics.PLAYER_HEIGHT, 0))
 performance_monitor = PerformanceMonitor()
+frame_pacer = FramePacer(fps=60)
 
 # Global update function
 def update():
@@ -0,0 +1,3 @@
+from engine.core import bootstrap, Colors, Physics, combine, FramePacer, PerformanceMonitor, njit, load_shared_model
+
+__all__ = ['bootstrap', 'Colors', 'Physics', 'combine', 'FramePacer', 'PerformanceMonitor', 'njit', 'load_shared_model']
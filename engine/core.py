@@ -0,0 +1,203 @@
+"""Pieces shared by every B3313 build: app bootstrap, palette, physics config and utilities"""
+from ursina import (
+    Ursina, Entity, application, window, color, time, Vec3, Vec4, Mesh, destroy, load_model,
+    print_warning
+)
+from panda3d.core import Mat4, TransparencyAttrib
+from direct.task.TaskManagerGlobal import taskMgr
+from math import inf
+import time as pytime
+import numpy as np
+try:
+    from numba import njit
+except ImportError: # Numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+
+# 🚀 Engine Bootstrap
+def bootstrap(title, vsync=False):
+    """Create the Ursina app with the window setup all builds share"""
+    app = Ursina(
+        vsync=vsync,
+        development_mode=False,
+        size=(1280, 720),
+        borderless=False,
+        fullscreen=False
+    )
+    window.title = title
+    window.color = color.rgb(8, 10, 22)
+    window.fps_counter.enabled = True
+    window.entity_counter.enabled = True
+    return app
+
+
+# 🎨 Color Constants
+class Colors:
+    OBSERVATORY = color.rgba(210, 230, 255, 255)
+    ENGINE = color.rgba(90, 90, 160, 240)
+    GLASS = color.rgba(160, 220, 255, 120)
+    STAR = color.yellow
+    DOME_RED = color.rgb(200, 50, 50)
+    DOME_GREEN = color.rgb(50, 150, 50)
+    DOME_CYAN = color.rgb(50, 150, 200)
+    METAL = color.rgb(100, 100, 100)
+    ENERGY = color.rgb(100, 150, 255)
+
+
+# 🌍 Physics Constants (builds tune these by subclassing)
+class Physics:
+    GRAVITY = 25
+    PLANET_CENTER = Vec3(0, 0, 0)
+    PLANET_RADIUS = 32
+    PLAYER_HEIGHT = 2
+    PLAYER_RADIUS = 0.5
+    JUMP_HEIGHT = 5
+    MOVE_SPEED = 7
+    AIR_CONTROL = 0.8
+    FRICTION = 0.9
+
+
+# --------- load_shared_model(): resolve a model name like Entity does ---------
+def load_shared_model(name, use_deepcopy=False):
+    """Load a model by name from the asset folder, then Ursina's bundled models.
+    Warns and returns None when neither has it."""
+    m = load_model(name, application.asset_folder, use_deepcopy=use_deepcopy)
+    if not m:
+        m = load_model(name, application.internal_models_compressed_folder, use_deepcopy=use_deepcopy)
+    if not m:
+        print_warning('missing model:', name)
+    return m
+
+
+# --------- combine(): bake static entities into one Mesh ---------
+def combine(entities, name=None):
+    """Merge static entities into a single Mesh (one draw call) and destroy the originals"""
+    if not entities:
+        return None
+    verts, tris, norms, cols = [], [], [], []
+    offset = 0
+    for e in entities:
+        if e.model is None:  # nothing to draw
+            destroy(e)
+            continue
+        # Cached models are handed out as plain NodePath copies, reload with vertex data
+        if not getattr(e.model, 'vertices', None):
+            e.model = load_model(e.model.name, use_deepcopy=True)
+            e.origin = e.origin
+        m = e.model
+        # The model node carries the origin offset on top of the entity transform
+        mat = m.getNetTransform().getMat()
+        normal_mat = Mat4(mat)
+        normal_mat.invert_in_place()
+        normal_mat.transpose_in_place()
+        n = len(m.vertices)
+
+        verts.extend(Vec3(*mat.xformPoint(v)) for v in m.vertices)
+        # Meshes without normals were lit with GL's default +Z normal
+        norms.extend(Vec3(*normal_mat.xformVec(v)).normalized() for v in (m.normals or [(0, 0, 1)] * n))
+        c = e.color
+        if m.colors:
+            cols.extend(Vec4(v[0] * c[0], v[1] * c[1], v[2] * c[2], v[3] * c[3]) for v in m.colors)
+        else:
+            cols.extend([c] * n)
+
+        if not m.triangles:
+            indices = list(range(n))
+        else:
+            indices = []
+            for t in m.triangles:
+                if isinstance(t, int):
+                    indices.append(t)
+                elif len(t) == 3:
+                    indices.extend(t)
+                elif len(t) == 4:  # quad -> two triangles
+                    indices.extend((t[0], t[1], t[2], t[2], t[3], t[0]))
+        tris.extend(
+            (indices[i] + offset, indices[i+1] + offset, indices[i+2] + offset)
+            for i in range(0, len(indices) - 2, 3)
+        )
+        offset += n
+        destroy(e)
+
+    combined = Entity(
+        name=name or "combined",
+        model=Mesh(vertices=verts, triangles=tris, normals=norms, colors=cols, static=True)
+    )
+    if any(c[3] < 1 for c in cols):
+        combined.set_transparency(TransparencyAttrib.M_dual)
+    return combined
+
+
+class FramePacer:
+    """Caps the frame rate in place of vsync, without blocking inside the buffer swap"""
+    def __init__(self, fps=60, spin_margin=0.0005):
+        self.interval = 1 / fps
+        self.spin_margin = spin_margin
+        self.next_frame = pytime.perf_counter() + self.interval
+        # Panda3D polls input in dataLoop (sort -50); waiting just before it means
+        # the frame is simulated from input read after the wait, not before it
+        taskMgr.add(self.wait, 'frame_pacer', sort=-60)
+
+    def wait(self, task):
+        # Sleep until just short of the deadline, then spin to hit it precisely
+        remaining = self.next_frame - pytime.perf_counter()
+        if remaining > self.spin_margin:
+            pytime.sleep(remaining - self.spin_margin)
+        while pytime.perf_counter() < self.next_frame:
+            pass
+
+        self.next_frame += self.interval
+        now = pytime.perf_counter()
+        if self.next_frame < now: # missed a frame: resync instead of catching up
+            self.next_frame = now + self.interval
+        return task.cont
+
+
+class PerformanceMonitor:
+    def __init__(self, max_samples=600):
+        # Fixed ring buffer with running sum/min/max: no allocation per frame
+        self.fps_samples = np.empty(max_samples, dtype=np.float64)
+        self.last_log_time = pytime.time()
+        self.log_interval = 10
+        self.reset()
+
+    def reset(self):
+        self.head = 0
+        self.count = 0
+        self.fps_sum = 0.0
+        self.fps_min = inf
+        self.fps_max = 0.0
+
+    def add_sample(self, fps):
+        samples = self.fps_samples
+        evicted = None
+        if self.count < len(samples):
+            self.count += 1
+        else:
+            evicted = samples[self.head]
+            self.fps_sum -= evicted
+        samples[self.head] = fps
+        self.head = (self.head + 1) % len(samples)
+        self.fps_sum += fps
+
+        if evicted is not None and (evicted == self.fps_min or evicted == self.fps_max):
+            # The old extreme just left the window, rescan once
+            self.fps_min = samples.min()
+            self.fps_max = samples.max()
+        else:
+            self.fps_min = min(self.fps_min, fps)
+            self.fps_max = max(self.fps_max, fps)
+
+    def update(self):
+        if time.dt > 0:
+            self.add_sample(1 / time.dt)
+        current_time = pytime.time()
+        if current_time - self.last_log_time >= self.log_interval:
+            if self.count:
+                avg_fps = self.fps_sum / self.count
+                print(f"[{pytime.strftime('%H:%M:%S')}] FPS Stats - Avg: {avg_fps:.1f}, Min: {self.fps_min:.1f}, Max: {self.fps_max:.1f}")
+            self.reset()
+            self.last_log_time = current_time
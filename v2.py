@@ -5,9 +5,13 @@ from ursina import (
     destroy,
     Sky
 )
-from math import sin, cos, pi, radians, sqrt, atan2, degrees
+from panda3d.core import NodePath
+from math import sin, cos, radians, sqrt, atan2, degrees
 from functools import lru_cache
 import time as pytime
+import numpy as np
+
+from engine import load_shared_model
 
 # 🚀 Engine Bootstrap
 app = Ursina(
@@ -48,7 +52,30 @@ class Physics:
     AIR_CONTROL = 0.8
     FRICTION = 0.9
 
+# 🧭 World Layout (fixed, so every pose is computed once at import)
+def _dome_pose(x, y, z):
+    inv_len = 1.0 / sqrt(x * x + y * y + z * z)
+    x, y, z = x * inv_len, y * inv_len, z * inv_len
+    return (x, y, z), -degrees(atan2(z, y)), degrees(atan2(x, z))
+
+_R = Physics.PLANET_RADIUS
+# (x, y, z, rotation_y) of each decorative cube on the floor
+DECOR_CUBE_POSES = tuple(
+    (cos(radians(a)) * (_R - 0.2), 0, sin(radians(a)) * (_R - 0.2), -a)
+    for a in range(0, 360, 45)
+)
+# (up direction, rotation_x, rotation_y) of each dome
+DOME_POSES = tuple(_dome_pose(*d) for d in ((1, 1, 0), (-1, 1, 0), (0, 1, 1)))
+# Offsets from the engine room origin
+SUPPORT_OFFSETS = tuple((cos(radians(a)) * 5, 5, sin(radians(a)) * 5) for a in range(0, 360, 60))
+ENERGY_NODE_OFFSETS = tuple((cos(radians(a)) * 7, 2, sin(radians(a)) * 7) for a in range(0, 360, 72))
+
 class SphericalPlayer(Entity):
+    # Shared read-only vectors for update(); never mutate these in place
+    _ZERO = Vec3(0, 0, 0)
+    _FWD = Vec3(0, 0, -1)
+    _RIGHT = Vec3(1, 0, 0)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -73,44 +100,49 @@ class SphericalPlayer(Entity):
         # Input setup
         mouse.locked = True
         self.mouse_sensitivity = Vec2(100, 100)
-        
-        # Cache for surface normal
-        self._last_pos_tuple = None
-        self._cached_normal = None
 
     def get_surface_normal(self, pos):
-        """Get surface normal with simple caching"""
-        pos_tuple = (round(pos.x, 1), round(pos.y, 1), round(pos.z, 1))
-        if pos_tuple != self._last_pos_tuple:
-            self._last_pos_tuple = pos_tuple
-            self._cached_normal = (pos - Physics.PLANET_CENTER).normalized()
-        return self._cached_normal
+        """Get surface normal (recomputed every call: the player moves every frame)"""
+        # PLANET_CENTER is the origin and the player is never near it, so skip the
+        # subtraction and the zero-length check in normalized()
+        x, y, z = pos.x, pos.y, pos.z
+        inv_len = 1.0 / sqrt(x * x + y * y + z * z)
+        return Vec3(x * inv_len, y * inv_len, z * inv_len)
 
     def update(self):
+        # Resolve globals/attributes once; position and velocity are written back at the end
+        dt = time.dt
+        mv = mouse.velocity
+        hk = held_keys
+        R = Physics.PLANET_RADIUS
+        g = Physics.GRAVITY
+        pos = self.position
+        vel = self.velocity
+        grounded = self.grounded
+
         # Get surface normal
-        surface_normal = self.get_surface_normal(self.position)
+        surface_normal = self.get_surface_normal(pos)
         
         # Create up vector that's perpendicular to surface
-        world_forward = Vec3(0, 0, -1)
+        world_forward = self._FWD
         if abs(surface_normal.dot(world_forward)) > 0.99:
-            world_forward = Vec3(1, 0, 0)
+            world_forward = self._RIGHT
         
         right = world_forward.cross(surface_normal).normalized()
         forward = surface_normal.cross(right).normalized()
         
-        # Build rotation matrix manually (more stable than look_at)
-        self.model.setMat(self.model.getMat())
-        self.rotation_y += mouse.velocity[0] * self.mouse_sensitivity.x * time.dt
+        # Yaw from mouse
+        self.rotation_y += mv[0] * self.mouse_sensitivity.x * dt
 
         # Mouse look (camera pitch)
         self.camera_pivot.rotation_x = clamp(
-            self.camera_pivot.rotation_x - mouse.velocity[1] * self.mouse_sensitivity.y * time.dt,
+            self.camera_pivot.rotation_x - mv[1] * self.mouse_sensitivity.y * dt,
             -90, 90
         )
 
         # Movement input
-        move_x = held_keys['d'] - held_keys['a']
-        move_z = held_keys['w'] - held_keys['s']
+        move_x = hk['d'] - hk['a']
+        move_z = hk['w'] - hk['s']
         
         if move_x != 0 or move_z != 0:
             # Normalize movement vector
@@ -119,35 +151,38 @@ class SphericalPlayer(Entity):
             move_z /= move_length
             
             move_direction = self.forward * move_z + self.right * move_x
-            move_amount = move_direction * self.speed * (Physics.AIR_CONTROL if not self.grounded else 1.0)
+            move_amount = move_direction * self.speed * (Physics.AIR_CONTROL if not grounded else 1.0)
         else:
-            move_amount = Vec3(0, 0, 0)
+            move_amount = self._ZERO
         
         # Apply physics
-        gravity_force = -surface_normal * Physics.GRAVITY
-        self.velocity += gravity_force * time.dt
+        vel -= surface_normal * (g * dt)
 
         # Apply movement
-        self.position += (self.velocity + move_amount) * time.dt
+        pos += (vel + move_amount) * dt
 
         # Ground collision and correction
-        distance_from_center = self.position.length()
-        target_distance = Physics.PLANET_RADIUS + self.height / 2
+        target_distance = R + self.height / 2
+        dist_sq = pos.x * pos.x + pos.y * pos.y + pos.z * pos.z
 
-        if distance_from_center <= target_distance:
-            self.grounded = True
-            self.position = self.position.normalized() * target_distance
+        if dist_sq <= target_distance * target_distance:
+            grounded = True
+            pos = pos * (target_distance / sqrt(dist_sq))
 
             # Cancel radial velocity
-            radial_velocity = self.velocity.dot(surface_normal)
+            radial_velocity = vel.dot(surface_normal)
             if radial_velocity < 0:
-                self.velocity -= surface_normal * radial_velocity
+                vel -= surface_normal * radial_velocity
 
             # Apply friction when not moving
             if move_x == 0 and move_z == 0:
-                self.velocity *= Physics.FRICTION
+                vel *= Physics.FRICTION
         else:
-            self.grounded = False
+            grounded = False
+
+        self.position = pos
+        self.velocity = vel
+        self.grounded = grounded
 
     def jump(self):
         if self.grounded:
@@ -166,15 +201,23 @@ class ObservatoryWorld:
     def __init__(self):
         self.entities = []
         self.animated_entities = []
+        # Each shape is loaded once; entities get their own node over the same Geom
+        self.models = {name: load_shared_model(name) for name in ('cube', 'sphere')}
         self.create_world()
 
+    def shared_model(self, name):
+        model = self.models[name]
+        if model is None:  # already warned, let the Entity resolve the name itself
+            return name
+        return model.copy_to(NodePath())
+
     def create_world(self):
         # Skybox
         Sky(texture='sky_default', color=color.white * 0.8)
 
         # Main planetoid (no collider for performance)
         self.main_floor = Entity(
-            model='sphere',
+            model=self.shared_model('sphere'),
             scale=Physics.PLANET_RADIUS * 2,
             color=Colors.OBSERVATORY
         )
@@ -191,44 +234,38 @@ class ObservatoryWorld:
 
     def create_decorative_cubes(self):
         # Create cubes as a single combined entity for performance
-        for i in range(8):
-            angle = i * (360 / 8)
-            dir_vec = Vec3(cos(radians(angle)), 0, sin(radians(angle)))
-            position = dir_vec * (Physics.PLANET_RADIUS - 0.2)
-
+        for x, y, z, rotation_y in DECOR_CUBE_POSES:
             Entity(
-                model='cube',
+                model=self.shared_model('cube'),
                 color=Colors.METAL,
                 scale=(1.5, 0.8, 1.5),
-                position=position,
-                rotation=(0, -angle, 0),
-                parent=self.main_floor  # Parent to main floor for better performance
+                position=(x, y, z),
+                rotation=(0, rotation_y, 0),
+                parent=self.main_floor,  # Parent to main floor for better performance
+                collider=None
             )
 
     def create_domes(self):
-        dome_configs = [
-            (Vec3(1, 1, 0), Colors.DOME_RED),
-            (Vec3(-1, 1, 0), Colors.DOME_GREEN),
-            (Vec3(0, 1, 1), Colors.DOME_CYAN)
-        ]
+        dome_colors = (Colors.DOME_RED, Colors.DOME_GREEN, Colors.DOME_CYAN)
 
         self.domes = []
         self.warp_pads = []
 
-        for dir_vec, dome_color in dome_configs:
-            up_vec = dir_vec.normalized()
+        for (up, rotation_x, rotation_y), dome_color in zip(DOME_POSES, dome_colors):
+            up_vec = Vec3(*up)
             position = up_vec * Physics.PLANET_RADIUS
 
             # Create dome
             dome = Entity(
-                model='sphere',
+                model=self.shared_model('sphere'),
                 scale=8,
                 color=dome_color,
-                position=position
+                position=position,
+                collider=None
             )
             # Simplified orientation
-            dome.rotation_x = -degrees(atan2(up_vec.z, up_vec.y))
-            dome.rotation_y = degrees(atan2(up_vec.x, up_vec.z))
+            dome.rotation_x = rotation_x
+            dome.rotation_y = rotation_y
             self.domes.append(dome)
             self.entities.append(dome)
 
@@ -237,7 +274,8 @@ class ObservatoryWorld:
                 model='cylinder',
                 color=dome_color,
                 scale=(3.6, 0.4, 3.6),
-                position=position + up_vec * 0.2
+                position=position + up_vec * 0.2,
+                collider=None
             )
             warp_pad.rotation_x = dome.rotation_x
             warp_pad.rotation_y = dome.rotation_y
@@ -246,11 +284,12 @@ class ObservatoryWorld:
 
     def create_central_star(self):
         self.central_star = Entity(
-            model='sphere',
+            model=self.shared_model('sphere'),
             color=Colors.STAR,
             scale=2,
             position=(0, Physics.PLANET_RADIUS + 8, 0),
-            unlit=True
+            unlit=True,
+            collider=None
         )
         self.entities.append(self.central_star)
         self.animated_entities.append(self.central_star)
@@ -277,33 +316,32 @@ class ObservatoryWorld:
         self.entities.append(self.engine_core)
 
         # Supports - create directly without combine for performance
-        for angle in range(0, 360, 60):
+        for offset in SUPPORT_OFFSETS:
             Entity(
-                model='cube',
+                model=self.shared_model('cube'),
                 color=Colors.METAL,
                 scale=(0.2, 10, 0.2),
-                position=engine_pos + Vec3(cos(radians(angle)) * 5, 5, sin(radians(angle)) * 5),
+                position=engine_pos + Vec3(*offset),
                 parent=self.engine_base
             )
 
         # Energy nodes
         self.energy_nodes = []
-        for i in range(5):
-            theta = i * (2 * pi / 5)
-            x = 7 * cos(theta)
-            z = 7 * sin(theta)
-            y = 2
+        for offset in ENERGY_NODE_OFFSETS:
             node = Entity(
-                model='sphere', 
+                model=self.shared_model('sphere'), 
                 color=Colors.ENERGY, 
                 scale=0.8, 
-                position=engine_pos + Vec3(x, y, z), 
+                position=engine_pos + Vec3(*offset), 
                 unlit=True
             )
             self.energy_nodes.append(node)
             self.entities.append(node)
             self.animated_entities.append(node)
 
+        # Per-node phase offsets for the pulse in update_animations (float64: t is epoch seconds)
+        self._phase = np.arange(len(self.energy_nodes), dtype=np.float64)
+
     def setup_lighting(self):
         DirectionalLight(direction=Vec3(1, -2, -1).normalized(), shadows=False, color=color.white * 0.2)
         AmbientLight(color=color.white * 0.4)
@@ -314,39 +352,45 @@ class ObservatoryWorld:
         self.central_star.scale = star_scale
         self.central_star.rotation_y += 10 * time.dt
         
-        # Update energy nodes with cached sin values
+        # Update energy nodes: one vectorized sin for every node
         base_scale = 0.8
         amplitude = 0.15
-        for i, node in enumerate(self.energy_nodes):
-            node.scale = base_scale + sin(t * 3 + i) * amplitude
+        scales = base_scale + amplitude * np.sin(t * 3 + self._phase)
+        for node, scale in zip(self.energy_nodes, scales.tolist()):
+            node.scale = scale
 
 class PerformanceMonitor:
     def __init__(self):
-        self.fps_samples = []
         self.last_log_time = pytime.time()
         self.log_interval = 10
-        self.sample_count = 0
-        self.max_samples = 600  # 10 seconds at 60 FPS
+        self.reset()
+
+    def reset(self):
+        # Average FPS over an interval is frames / elapsed time, so no per-frame 1/dt;
+        # the slowest and fastest frames are tracked as dt and inverted only when logging
+        self._frame_count = 0
+        self._elapsed_dt = 0.0
+        self._min_dt = float('inf')
+        self._max_dt = 0.0
 
     def update(self):
-        if time.dt > 0:
-            self.fps_samples.append(1 / time.dt)
-            self.sample_count += 1
-            
-            # Limit sample buffer size
-            if self.sample_count > self.max_samples:
-                self.fps_samples.pop(0)
-                self.sample_count = self.max_samples
+        dt = time.dt
+        if dt > 0:
+            self._frame_count += 1
+            self._elapsed_dt += dt
+            if dt < self._min_dt:
+                self._min_dt = dt
+            if dt > self._max_dt:
+                self._max_dt = dt
         
         current_time = pytime.time()
         if current_time - self.last_log_time >= self.log_interval:
-            if self.fps_samples:
-                avg_fps = sum(self.fps_samples) / len(self.fps_samples)
-                min_fps = min(self.fps_samples)
-                max_fps = max(self.fps_samples)
+            if self._frame_count:
+                avg_fps = self._frame_count / self._elapsed_dt
+                min_fps = 1 / self._max_dt
+                max_fps = 1 / self._min_dt
                 print(f"[{pytime.strftime('%H:%M:%S')}] FPS Stats - Avg: {avg_fps:.1f}, Min: {min_fps:.1f}, Max: {max_fps:.1f}")
-            self.fps_samples = []
-            self.sample_count = 0
+            self.reset()
             self.last_log_time = current_time
 
 # Initialize game components
@@ -356,7 +400,7 @@ performance_monitor = PerformanceMonitor()
 
 # Global update function
 def update():
-    t = time.time  # Use Ursina's time.time instead of pytime.time()
+    t = time.time()
     world.update_animations(t)
     performance_monitor.update()
 
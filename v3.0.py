@@ -2,11 +2,13 @@ from ursina import (
     Ursina, Entity, camera, window, color, held_keys, mouse, time, clamp,
     Vec2, Vec3,
     Mesh, DirectionalLight, AmbientLight,
-    Sky, destroy
+    Sky
 )
-from math import sin, cos, pi, radians, sqrt, atan2, degrees
+from math import sin, cos, radians, sqrt, atan2, degrees
 from functools import lru_cache
-import time as pytime
+import numpy as np
+
+from engine import njit, load_shared_model
 
 # 🚀 Engine Bootstrap
 app = Ursina(
@@ -47,6 +49,167 @@ class Physics:
     AIR_CONTROL = 0.8
     FRICTION = 0.9
 
+# Whole-degree trig tables for world construction: every prop ring steps in whole degrees
+_DEG_COS = {a: cos(radians(a)) for a in range(360)}
+_DEG_SIN = {a: sin(radians(a)) for a in range(360)}
+
+@njit(cache=True, fastmath=True)
+def physics_step(pos, vel, center, cam_fwd, cam_right, move_x, move_z, dt, grounded,
+                 radius, height, gravity, speed, air_control, friction):
+    """Advance pos/vel in place by one frame and return the new grounded flag."""
+    # Surface normal
+    nx, ny, nz = pos[0] - center[0], pos[1] - center[1], pos[2] - center[2]
+    inv = 1.0 / np.sqrt(nx*nx + ny*ny + nz*nz)
+    nx *= inv
+    ny *= inv
+    nz *= inv
+
+    # Calculate movement (the tangent basis is only needed while a key is held)
+    moving = move_x != 0 or move_z != 0
+    mx = my = mz = 0.0
+    if moving:
+        # Project camera directions onto tangent plane
+        d = nx*cam_fwd[0] + ny*cam_fwd[1] + nz*cam_fwd[2]
+        fx, fy, fz = cam_fwd[0] - nx*d, cam_fwd[1] - ny*d, cam_fwd[2] - nz*d
+        length = np.sqrt(fx*fx + fy*fy + fz*fz)
+        if length > 0:
+            fx /= length
+            fy /= length
+            fz /= length
+        d = nx*cam_right[0] + ny*cam_right[1] + nz*cam_right[2]
+        rx, ry, rz = cam_right[0] - nx*d, cam_right[1] - ny*d, cam_right[2] - nz*d
+        length = np.sqrt(rx*rx + ry*ry + rz*rz)
+        if length > 0:
+            rx /= length
+            ry /= length
+            rz /= length
+
+        mx, my, mz = fx*move_z + rx*move_x, fy*move_z + ry*move_x, fz*move_z + rz*move_x
+        m2 = mx*mx + my*my + mz*mz
+        if m2 > 0:
+            k = speed * (1.0 if grounded else air_control) / np.sqrt(m2)
+            mx *= k
+            my *= k
+            mz *= k
+
+    # Apply physics, then movement
+    g = gravity * dt
+    vel[0] -= nx * g
+    vel[1] -= ny * g
+    vel[2] -= nz * g
+    pos[0] += (vel[0] + mx) * dt
+    pos[1] += (vel[1] + my) * dt
+    pos[2] += (vel[2] + mz) * dt
+
+    # Ground collision and correction
+    target_distance = radius + height / 2
+    dist_sq = pos[0]*pos[0] + pos[1]*pos[1] + pos[2]*pos[2]
+    if dist_sq <= target_distance * target_distance:
+        pos *= target_distance / np.sqrt(dist_sq)
+        radial_velocity = vel[0]*nx + vel[1]*ny + vel[2]*nz
+        if radial_velocity < 0:
+            vel[0] -= nx * radial_velocity
+            vel[1] -= ny * radial_velocity
+            vel[2] -= nz * radial_velocity
+        if not moving:
+            vel *= friction
+        return True
+    return False
+
+def _rotation_matrix(rotation):
+    """Row-vector matrix for an Entity rotation: a y angle or an (x, y, z) euler tuple"""
+    rx, ry, rz = (0, rotation, 0) if np.isscalar(rotation) else rotation
+    cx, sx = cos(radians(rx)), sin(radians(rx))
+    cy, sy = cos(radians(ry)), sin(radians(ry))
+    cz, sz = cos(radians(rz)), sin(radians(rz))
+    roll = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    pitch = np.array([[1, 0, 0], [0, cx, sx], [0, -sx, cx]])
+    yaw = np.array([[cy, 0, -sy], [0, 1, 0], [sy, 0, cy]])
+    return roll @ pitch @ yaw
+
+@lru_cache(maxsize=None)
+def icosphere_data(subdivisions):
+    """Vertices and triangle indices of a diameter-1 icosphere, built once per level.
+    The returned arrays are shared, so callers must not modify them."""
+    def on_sphere(x, y, z):
+        k = 0.5 / sqrt(x*x + y*y + z*z)
+        return (x * k, y * k, z * k)
+
+    t = (1 + sqrt(5)) / 2
+    verts = [on_sphere(*v) for v in (
+        (-1, t, 0), (1, t, 0), (-1, -t, 0), (1, -t, 0),
+        (0, -1, t), (0, 1, t), (0, -1, -t), (0, 1, -t),
+        (t, 0, -1), (t, 0, 1), (-t, 0, -1), (-t, 0, 1)
+    )]
+    faces = [
+        (0, 11, 5), (0, 5, 1), (0, 1, 7), (0, 7, 10), (0, 10, 11),
+        (1, 5, 9), (5, 11, 4), (11, 10, 2), (10, 7, 6), (7, 1, 8),
+        (3, 9, 4), (3, 4, 2), (3, 2, 6), (3, 6, 8), (3, 8, 9),
+        (4, 9, 5), (2, 4, 11), (6, 2, 10), (8, 6, 7), (9, 8, 1)
+    ]
+    for _ in range(subdivisions):
+        midpoints = {}
+        def midpoint(a, b):
+            key = (a, b) if a < b else (b, a)
+            if key not in midpoints:
+                midpoints[key] = len(verts)
+                verts.append(on_sphere(*((verts[a][k] + verts[b][k]) / 2 for k in range(3))))
+            return midpoints[key]
+
+        split = []
+        for a, b, c in faces:
+            ab, bc, ca = midpoint(a, b), midpoint(b, c), midpoint(c, a)
+            split += [(a, ab, ca), (b, bc, ab), (c, ca, bc), (ab, bc, ca)]
+        faces = split
+
+    # Reverse the winding to match the front faces of Ursina's bundled models
+    return np.array(verts), np.array(faces)[:, ::-1].reshape(-1)
+
+def icosphere(subdivisions=2):
+    """Static icosphere Mesh the same size as the built-in 'sphere' model, with far
+    fewer vertices. Each call returns a new Mesh around the shared cached vertex data."""
+    verts, triangles = icosphere_data(subdivisions)
+    return Mesh(
+        vertices=verts.tolist(),
+        normals=(verts * 2).tolist(),
+        triangles=triangles.tolist(),
+        mode='triangle',
+        static=True
+    )
+
+def bake_copies(model, poses, scale=(1, 1, 1), origin=(0, 0, 0), colors=None):
+    """Build one static Mesh holding a copy of a model (a name or a Mesh) per
+    (position, rotation) pose, optionally tinting each copy with its own vertex color"""
+    base = load_shared_model(model, use_deepcopy=True) if isinstance(model, str) else model
+    if base is None:  # load_shared_model has already warned
+        return None
+    scale = np.asarray(scale, dtype=np.float64)
+    verts = (np.asarray(base.vertices, dtype=np.float64) - origin) * scale
+    # Normals take the inverse scale so they stay perpendicular under non-uniform scaling
+    normals = np.asarray(base.normals, dtype=np.float64) / scale
+    normals /= np.sqrt((normals * normals).sum(axis=1, keepdims=True))
+
+    all_verts, all_normals = [], []
+    for position, rotation in poses:
+        rot = _rotation_matrix(rotation)
+        all_verts.append(verts @ rot + np.asarray(position, dtype=np.float64))
+        all_normals.append(normals @ rot)
+
+    n = len(base.vertices)
+    triangles = None
+    if base.triangles:
+        tris = np.asarray(base.triangles).reshape(-1)
+        triangles = (np.tile(tris, len(poses)) + np.repeat(np.arange(len(poses)) * n, len(tris))).tolist()
+    return Mesh(
+        vertices=np.vstack(all_verts).tolist(),
+        normals=np.vstack(all_normals).tolist(),
+        uvs=list(base.uvs) * len(poses),
+        colors=[c for c in colors for _ in range(n)] if colors else None,
+        triangles=triangles,
+        mode='triangle',
+        static=True
+    )
+
 class SphericalPlayer(Entity):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -55,10 +218,16 @@ class SphericalPlayer(Entity):
         self.speed = Physics.MOVE_SPEED
         self.jump_height = Physics.JUMP_HEIGHT
         self.height = Physics.PLAYER_HEIGHT
-        self.velocity = Vec3(0, 0, 0)
         self.grounded = False
         self.start_pos = Vec3(self.position)  # Fixed: Use Vec3() instead of copy()
 
+        # Physics state lives in float32 arrays for physics_step; self.position is written once per frame
+        self._pos = np.array(self.position, dtype=np.float32)
+        self._vel = np.zeros(3, dtype=np.float32)
+        self._cam_fwd = np.zeros(3, dtype=np.float32)
+        self._cam_right = np.zeros(3, dtype=np.float32)
+        self._center = np.array(Physics.PLANET_CENTER, dtype=np.float32)
+
         # Camera setup
         self.camera_pivot = Entity(parent=self, y=self.height/2)
         camera.parent = self.camera_pivot
@@ -70,79 +239,69 @@ class SphericalPlayer(Entity):
         mouse.locked = True
         self.mouse_sensitivity = Vec2(100, 100)
 
-        # Cache for surface normal
-        self._last_pos_tuple = None
-        self._cached_normal = None
-
     def get_surface_normal(self, pos):
-        """Get surface normal with simple caching"""
-        pos_tuple = (round(pos.x, 1), round(pos.y, 1), round(pos.z, 1))
-        if pos_tuple != self._last_pos_tuple:
-            self._last_pos_tuple = pos_tuple
-            self._cached_normal = (pos - Physics.PLANET_CENTER).normalized()
-        return self._cached_normal
+        """Get surface normal (recomputed every call: the player moves every frame)"""
+        # PLANET_CENTER is the origin and the player is never near it, so skip the
+        # subtraction and the zero-length check in normalized()
+        x, y, z = pos.x, pos.y, pos.z
+        inv_len = 1.0 / sqrt(x * x + y * y + z * z)
+        return Vec3(x * inv_len, y * inv_len, z * inv_len)
 
     def update(self):
-        # Get surface normal
-        surface_normal = self.get_surface_normal(self.position)
+        dt = time.dt
+        mv = mouse.velocity
+
+        # Movement input
+        hk = held_keys
+        move_x = hk['d'] - hk['a']
+        move_z = hk['w'] - hk['s']
+
+        # Standing still on the ground with no mouse input: nothing would change this frame
+        vel = self._vel
+        if (not (move_x or move_z or mv[0] or mv[1]) and self.grounded
+                and vel[0]*vel[0] + vel[1]*vel[1] + vel[2]*vel[2] < 1e-6):
+            return
 
         # Update rotation (yaw)
-        self.rotation_y += mouse.velocity[0] * self.mouse_sensitivity.x * time.dt
+        yaw = self.rotation_y + mv[0] * self.mouse_sensitivity.x * dt
+        self.rotation_y = yaw
 
         # Camera pitch
-        self.camera_pivot.rotation_x = clamp(
-            self.camera_pivot.rotation_x - mouse.velocity[1] * self.mouse_sensitivity.y * time.dt,
+        pitch = clamp(
+            self.camera_pivot.rotation_x - mv[1] * self.mouse_sensitivity.y * dt,
             -90, 90
         )
-
-        # Movement input
-        move_x = held_keys['d'] - held_keys['a']
-        move_z = held_keys['w'] - held_keys['s']
-
-        # Project camera directions onto tangent plane
-        camera_forward = camera.forward
-        camera_right = camera.right
-        tangent_forward = (camera_forward - surface_normal * surface_normal.dot(camera_forward)).normalized()
-        tangent_right = (camera_right - surface_normal * surface_normal.dot(camera_right)).normalized()
-
-        # Calculate movement
-        if move_x != 0 or move_z != 0:
-            move_direction = (tangent_forward * move_z + tangent_right * move_x).normalized()
-            move_amount = move_direction * self.speed * (Physics.AIR_CONTROL if not self.grounded else 1.0)
-        else:
-            move_amount = Vec3(0, 0, 0)
-
-        # Apply physics
-        gravity_force = -surface_normal * Physics.GRAVITY
-        self.velocity += gravity_force * time.dt
-
-        # Apply movement
-        self.position += (self.velocity + move_amount) * time.dt
-
-        # Ground collision and correction
-        distance_from_center = self.position.length()
-        target_distance = Physics.PLANET_RADIUS + self.height / 2
-
-        if distance_from_center <= target_distance:
-            self.grounded = True
-            self.position = self.position.normalized() * target_distance
-            radial_velocity = self.velocity.dot(surface_normal)
-            if radial_velocity < 0:
-                self.velocity -= surface_normal * radial_velocity
-            if move_x == 0 and move_z == 0:
-                self.velocity *= Physics.FRICTION
-        else:
-            self.grounded = False
+        self.camera_pivot.rotation_x = pitch
+
+        # The camera only yaws with the player and pitches with the pivot, so build its
+        # forward/right from those two angles instead of reading camera.forward/right.
+        # physics_step only reads them while a movement key is held.
+        cam_fwd, cam_right = self._cam_fwd, self._cam_right
+        if move_x or move_z:
+            cy, sy = cos(radians(yaw)), sin(radians(yaw))
+            cp, sp = cos(radians(pitch)), sin(radians(pitch))
+            cam_fwd[0], cam_fwd[1], cam_fwd[2] = sy * cp, -sp, cy * cp
+            cam_right[0], cam_right[1], cam_right[2] = cy, 0.0, -sy
+
+        # Integrate in the compiled kernel, then write the result back once
+        self.grounded = physics_step(
+            self._pos, self._vel, self._center, cam_fwd, cam_right,
+            move_x, move_z, dt, self.grounded,
+            Physics.PLANET_RADIUS, self.height, Physics.GRAVITY, self.speed,
+            Physics.AIR_CONTROL, Physics.FRICTION
+        )
+        self.position = Vec3(*self._pos)
 
     def jump(self):
         if self.grounded:
             surface_normal = self.get_surface_normal(self.position)
-            self.velocity += surface_normal * self.jump_height
+            self._vel += np.array(surface_normal, dtype=np.float32) * self.jump_height
             self.grounded = False
 
     def reset_position(self):
         self.position = Vec3(self.start_pos)  # Fixed: Use Vec3() instead of copy()
-        self.velocity = Vec3(0, 0, 0)
+        self._pos[:] = self.start_pos
+        self._vel[:] = 0
         self.rotation = Vec3(0, 0, 0)
         self.camera_pivot.rotation_x = 0
         print("Player reset to starting position")
@@ -151,13 +310,12 @@ class ObservatoryWorld:
     def __init__(self):
         self.entities = []
         self.animated_entities = []
-        self.warp_pads = []
         self.create_world()
 
     def create_world(self):
         Sky(texture='sky_default', color=color.white * 0.8)
         self.main_floor = Entity(
-            model='sphere',
+            model=icosphere(3),
             scale=Physics.PLANET_RADIUS * 2,
             color=Colors.OBSERVATORY
         )
@@ -169,18 +327,18 @@ class ObservatoryWorld:
         self.setup_lighting()
 
     def create_decorative_cubes(self):
+        poses = []
         for i in range(8):
-            angle = i * (360 / 8)
-            dir_vec = Vec3(cos(radians(angle)), 0, sin(radians(angle)))
-            position = dir_vec * (Physics.PLANET_RADIUS - 0.2)
-            Entity(
-                model='cube',
-                color=Colors.METAL,
-                scale=(1.5, 0.8, 1.5),
-                position=position,
-                rotation=(0, -angle, 0),
-                parent=self.main_floor
-            )
+            angle = i * 360 // 8
+            dir_vec = Vec3(_DEG_COS[angle], 0, _DEG_SIN[angle])
+            poses.append((dir_vec * (Physics.PLANET_RADIUS - 0.2), -angle))
+        # All 8 cubes in one mesh, positioned in the floor's local space as before
+        self.decor_cubes = Entity(
+            model=bake_copies('cube', poses, scale=(1.5, 0.8, 1.5)),
+            color=Colors.METAL,
+            parent=self.main_floor,
+            collider=None
+        )
 
     def create_domes(self):
         dome_configs = [
@@ -188,40 +346,34 @@ class ObservatoryWorld:
             (Vec3(-1, 1, 0), Colors.DOME_GREEN),
             (Vec3(0, 1, 1), Colors.DOME_CYAN)
         ]
-        self.domes = []
+        dome_poses, pad_poses, dome_colors = [], [], []
         for dir_vec, dome_color in dome_configs:
             up_vec = dir_vec.normalized()
             position = up_vec * Physics.PLANET_RADIUS
-            dome = Entity(
-                model='sphere',
-                scale=8,
-                color=dome_color,
-                position=position
-            )
-            dome.rotation_x = -degrees(atan2(up_vec.z, up_vec.y))
-            dome.rotation_y = degrees(atan2(up_vec.x, up_vec.z))
-            self.domes.append(dome)
-            self.entities.append(dome)
-
-            warp_pad = Entity(
-                model='cylinder',
-                color=dome_color,
-                scale=(3.6, 0.4, 3.6),
-                position=position + up_vec * 0.2,
-                rotation=(dome.rotation_x, dome.rotation_y, 0),
-                collider=None
-            )
-            self.warp_pads.append(warp_pad)
-            self.entities.append(warp_pad)
+            rotation = (-degrees(atan2(up_vec.z, up_vec.y)), degrees(atan2(up_vec.x, up_vec.z)), 0)
+            dome_poses.append((position, rotation))
+            pad_poses.append((position + up_vec * 0.2, rotation))
+            dome_colors.append(dome_color)
+
+        # Three domes and three warp pads as two meshes, colored per vertex
+        self.domes = Entity(
+            model=bake_copies(icosphere(2), dome_poses, scale=8, colors=dome_colors),
+            collider=None
+        )
+        self.entities.append(self.domes)
+        self.warp_pads = Entity(
+            model=bake_copies('cylinder', pad_poses, scale=(3.6, 0.4, 3.6), colors=dome_colors),
+            collider=None
+        )
+        self.entities.append(self.warp_pads)
 
     def create_central_star(self):
         self.central_star = Entity(
-            model='sphere',
-            subdivisions=2,
+            model=icosphere(2),
             color=Colors.STAR,
             scale=2,
             position=(0, Physics.PLANET_RADIUS + 8, 0),
-            collider='sphere'
+            collider=None
         )
         self.entities.append(self.central_star)
         self.animated_entities.append(self.central_star)
@@ -246,29 +398,24 @@ class ObservatoryWorld:
         )
         self.entities.append(self.engine_core)
 
-        supports = []
-        for angle in range(0, 360, 60):
-            support = Entity(
-                model='cube',
-                color=Colors.METAL,
+        # Same placement the temporary support entities had: core height, z=-5, origin_y=-0.5
+        support_pos = Vec3(self.engine_core.x, self.engine_core.y, -5)
+        self.engine_supports = Entity(
+            model=bake_copies(
+                'cube',
+                [(support_pos, angle) for angle in range(0, 360, 60)],
                 scale=(0.6, 10, 0.6),
-                position=self.engine_core.position,
-                rotation=(0, angle, 0),
-                collider=None
-            )
-            support.origin_y = -0.5
-            support.z = -5
-            supports.append(support)
-        self.engine_supports = Entity(model=Mesh(vertices=sum([e.get_vertices() for e in supports], []), mode='triangle'), color=Colors.METAL)
+                origin=(0, -0.5, 0)
+            ),
+            color=Colors.METAL
+        )
         self.entities.append(self.engine_supports)
-        for support in supports:
-            destroy(support)
 
         self.energy_nodes = []
         for i in range(5):
-            theta = i * (2 * pi / 5)
-            x = self.engine_base.scale_x/2 * cos(theta) + self.engine_base.x
-            z = self.engine_base.scale_z/2 * sin(theta) + self.engine_base.z
+            angle = i * 360 // 5
+            x = self.engine_base.scale_x/2 * _DEG_COS[angle] + self.engine_base.x
+            z = self.engine_base.scale_z/2 * _DEG_SIN[angle] + self.engine_base.z
             y = self.engine_base.y + 2
             node = Entity(
                 model='sphere',